@@ -6,13 +6,21 @@ import warnings
 from pathlib import Path
 
 import pandas as pd
+from openpyxl import load_workbook
 from web3 import Web3
 
 import utils
 from logger import TelegramHandler, fmt, logger
 
+_PK_RE = re.compile(r'(0x)?[a-fA-F0-9]{64}')
+_PROXY_RE = re.compile(r'^(socks5|http)://')
 
-@dataclasses.dataclass
+_PK_SENTINELS = frozenset({'random', 'endrandom'})
+_INVITE_NONE = frozenset({'-', 'none'})
+_YES_VALUES = frozenset({'yes', '+', '1'})
+
+
+@dataclasses.dataclass(slots=True)
 class BotAccount:
     private_key: str
     username: str
@@ -24,16 +32,31 @@ class BotAccount:
     min_sleep_time: float = 1
     max_sleep_time: float = 10
     max_retries: int = 0
+    _hash: str = dataclasses.field(default=None, init=False, repr=False, compare=False)
 
     @property
     def hash(self):
-        return Web3.keccak(text=self.private_key).hex()
+        if self._hash is None:
+            self._hash = Web3.keccak(text=self.private_key).hex()
+        return self._hash
 
     @property
     def short_private_key(self):
         return f"{self.private_key[:8]}...{self.private_key[-8:]}"
 
 
+_DEFAULT_ACCOUNT_VALUES = {
+    field.name: field.default
+    for field in dataclasses.fields(BotAccount)
+    if field.init and field.default is not dataclasses.MISSING
+}
+_BOTACCOUNT_FIELD_NAMES = frozenset(field.name for field in dataclasses.fields(BotAccount) if field.init)
+
+
+def _without_exception(record: dict) -> bool:
+    return record['exception'] is None
+
+
 def read_accounts() -> list[BotAccount]:
     warnings.filterwarnings(
         'ignore',
@@ -65,7 +88,7 @@ def read_accounts() -> list[BotAccount]:
                     tg_handler.emit,
                     format=fmt,
                     level=telegram_log_level.upper(),
-                    filter=lambda record: record['exception'] is None
+                    filter=_without_exception
                 )
             elif telegram_token:
                 logger.error(f'[Account Loader] Missing chat_id in {telegram_path.name}')
@@ -74,14 +97,9 @@ def read_accounts() -> list[BotAccount]:
                 logger.error(f'[Account Loader] Missing token in {telegram_path.name}')
                 return False
 
-    yes_values = {'yes', '+', '1'}
-
     accounts = []
 
-    default_account_values = {}
-    for field in dataclasses.fields(BotAccount):
-        if field.default != dataclasses.MISSING:
-            default_account_values[field.name] = field.default
+    default_account_values = _DEFAULT_ACCOUNT_VALUES
 
     acounts_file_path = Path(__file__).parent / 'accounts.xlsx'
 
@@ -89,10 +107,6 @@ def read_accounts() -> list[BotAccount]:
         logger.error(f'[Account Loader] File "{acounts_file_path.name}" does not exist')
         return False
 
-    accounts_file = pd.ExcelFile(acounts_file_path)
-    sheets = [sheet.lower() for sheet in accounts_file.sheet_names]
-    del accounts_file
-
     dtype = {
         'Private Key': str,
         'Username': str,
@@ -106,15 +120,18 @@ def read_accounts() -> list[BotAccount]:
         'Mobile Proxy Changelink': str
     }
 
-    accounts_df = pd.read_excel(
-        acounts_file_path,
-        sheet_name='accounts',
-        dtype=dtype
-    )
-    accounts_df = accounts_df.apply(lambda x: x.str.strip() if x.dtype == object else x)
-    missing_account_columns = set(dtype.keys()) - set(accounts_df.columns)
-    accounts_df.columns = ['_'.join(column.lower().split(' ')) for column in accounts_df.columns]
-    unknown_account_columns = set(accounts_df.columns) - {field.name for field in dataclasses.fields(BotAccount)}
+    workbook = load_workbook(acounts_file_path, read_only=True, data_only=True)
+    try:
+        if 'accounts' not in workbook.sheetnames:
+            logger.error(f'[Account Loader] Missing "accounts" sheet in "{acounts_file_path.name}"')
+            return False
+        header_row = next(workbook['accounts'].iter_rows(max_row=1, values_only=True), ())
+    finally:
+        workbook.close()
+
+    header = [str(column) for column in header_row if column is not None]
+    missing_account_columns = set(dtype.keys()) - set(header)
+    unknown_account_columns = {column.lower().replace(' ', '_') for column in header} - _BOTACCOUNT_FIELD_NAMES
 
     if unknown_account_columns:
         logger.error(f'[Account Loader] Unknown account columns in "accounts" sheet: {", ".join(unknown_account_columns)}')
@@ -124,114 +141,119 @@ def read_accounts() -> list[BotAccount]:
         logger.error(f'[Account Loader] Missing account columns in "accounts" sheet: {", ".join(missing_account_columns)}')
         return False
 
+    accounts_df = pd.read_excel(
+        acounts_file_path,
+        sheet_name='accounts',
+        usecols=list(dtype.keys()),
+        dtype=dtype,
+        engine='openpyxl'
+    )
+    for column, column_type in dtype.items():
+        if column_type is str:
+            accounts_df[column] = accounts_df[column].str.strip()
+    accounts_df.columns = [column.lower().replace(' ', '_') for column in accounts_df.columns]
+
     accounts_df.dropna(subset=['private_key'], inplace=True)
+    accounts_df = accounts_df.fillna(value=default_account_values)
     for column in accounts_df.columns:
-        if column in default_account_values:
-            accounts_df[column] = accounts_df[column].fillna(
-                default_account_values[column]
-            )
+        if column not in default_account_values:
+            accounts_df[column] = accounts_df[column].where(accounts_df[column].notna(), None)
+
+    private_keys = accounts_df['private_key']
+    valid_private_keys = private_keys.str.fullmatch(_PK_RE) | private_keys.str.lower().isin(_PK_SENTINELS)
+
+    if not valid_private_keys.all():
+        invalid_private_keys = private_keys[~valid_private_keys]
+        invalid_private_key = invalid_private_keys.iloc[0]
+        if len(invalid_private_key) <= 16:
+            short_private_key = invalid_private_key
         else:
-            accounts_df[column] = accounts_df[column].fillna(-31294912).replace(-31294912, None)
+            short_private_key = f'{invalid_private_key[:8]}...{invalid_private_key[-8:]}'
+        logger.error(f'[Account Loader] Invalid private key "{short_private_key}" on row {invalid_private_keys.index[0] + 1} of "accounts" sheet')
+        return False
 
-    for row in accounts_df.itertuples():
-        if not re.match(r'^(0x)?[a-fA-F0-9]{64}$', row.private_key) and not row.private_key.lower() in {'random', 'endrandom'}:
-            if len(row.private_key) <= 16:
-                short_private_key = row.private_key
-            else:
-                short_private_key = f'{row.private_key[:8]}...{row.private_key[-8:]}'
-            logger.error(f'[Account Loader] Invalid private key "{short_private_key}" on row {row.Index + 1} of "accounts" sheet')
-            return False
+    random_indexes = []
+
+    for row in accounts_df.to_dict('records'):
+        index = len(accounts)
+        private_key_lower = row['private_key'].lower()
+
+        if private_key_lower == 'random':
+            if random_indexes and len(random_indexes[-1]) == 1:
+                logger.error(f'[Account Loader] Found not closed random account on line {random_indexes[-1][0] + 2}')
+                return False
+            random_indexes.append([index])
+        elif private_key_lower == 'endrandom':
+            if not random_indexes or len(random_indexes[-1]) == 2:
+                logger.error(f'[Account Loader] An EndRandom account found that is not preceded by a Random account on line {index + 3}')
+                return False
+            random_indexes[-1].append(index)
 
-        if row.proxy:
-            if re.match(r'(socks5|http)://', row.proxy):
+        if row['proxy']:
+            if _PROXY_RE.match(row['proxy']):
                 proxy = {
-                    'http': row.proxy,
-                    'https': row.proxy
+                    'http': row['proxy'],
+                    'https': row['proxy']
                 }
-            elif '/' not in row.proxy:
+            elif '/' not in row['proxy']:
                 proxy = {
-                    'http': f'http://{row.proxy}',
-                    'https': f'http://{row.proxy}'
+                    'http': f'http://{row["proxy"]}',
+                    'https': f'http://{row["proxy"]}'
                 }
             else:
-                logger.error(f'[Account Loader] Invalid proxy "{row.proxy}"')
+                logger.error(f'[Account Loader] Invalid proxy "{row["proxy"]}"')
                 return False
         else:
             proxy = None
 
-        if row.username and row.username.lower() != 'random' and not utils.check_username(row.username):
-            logger.error(f'[Account Loader] Invalid username "{row.username}"')
+        if row['username'] and row['username'].lower() != 'random' and not utils.check_username(row['username']):
+            logger.error(f'[Account Loader] Invalid username "{row["username"]}"')
             return False
 
-        if row.invite_code is None:
+        if row['invite_code'] is None:
             invite_code = '37FHD'
-        elif row.invite_code in {'-', 'none'}:
+        elif row['invite_code'] in _INVITE_NONE:
             invite_code = None
         else:
-            invite_code = row.invite_code.upper()
+            invite_code = row['invite_code'].upper()
 
             if not utils.check_invite_code(invite_code):
                 logger.error(f'[Account Loader] Invalid invite code "{invite_code}". Must be 5 uppercase letters or numbers or "-"/"none"')
                 return False
 
-        if isinstance(row.claim_badges, bool):
-            claim_badges = row.claim_badges
+        if isinstance(row['claim_badges'], bool):
+            claim_badges = row['claim_badges']
         else:
-            claim_badges = row.claim_badges.lower() in yes_values
+            claim_badges = row['claim_badges'].lower() in _YES_VALUES
 
-        if isinstance(row.auto_skip, bool):
-            auto_skip = row.auto_skip
+        if isinstance(row['auto_skip'], bool):
+            auto_skip = row['auto_skip']
         else:
-            auto_skip = row.auto_skip.lower() in yes_values
-
-        try:
-            account = BotAccount(
-                private_key=row.private_key,
-                username=row.username,
-                invite_code=invite_code,
-                claim_badges=claim_badges,
-                auto_skip=auto_skip,
-                min_sleep_time=row.min_sleep_time,
-                max_sleep_time=row.max_sleep_time,
-                max_retries=int(row.max_retries),
-                proxy=proxy,
-                mobile_proxy_changelink=row.mobile_proxy_changelink,
-            )
-        except AttributeError as e:
-            res = re.search("has no attribute '(?P<attribute>.+)'", str(e))
-            if res:
-                attribute = res.group('attribute')
-                logger.error(f'[Account Loader] Missing {attribute} column in "accounts" sheet')
-            else:
-                logger.error(f'[Account Loader] Failed to load account: {e}')
-            return
+            auto_skip = row['auto_skip'].lower() in _YES_VALUES
+
+        account = BotAccount(
+            private_key=row['private_key'],
+            username=row['username'],
+            invite_code=invite_code,
+            claim_badges=claim_badges,
+            auto_skip=auto_skip,
+            min_sleep_time=row['min_sleep_time'],
+            max_sleep_time=row['max_sleep_time'],
+            max_retries=int(row['max_retries']),
+            proxy=proxy,
+            mobile_proxy_changelink=row['mobile_proxy_changelink'],
+        )
 
         accounts.append(account)
 
-    random_indexes = []
-
-    for index, account in enumerate(accounts):
-        if account.private_key.lower() == 'random':
-            if random_indexes and len(random_indexes[-1]) == 1:
-                logger.error(f'[Account Loader] Found not closed random account on line {random_indexes[-1][0] + 2}')
-                return False
-            random_indexes.append([index])
-        elif account.private_key.lower() == 'endrandom':
-            if not random_indexes or len(random_indexes[-1]) == 2:
-                logger.error(f'[Account Loader] An EndRandom account found that is not preceded by a Random account on line {index + 3}')
-                return False
-            random_indexes[-1].append(index)
-
     if random_indexes:
         if len(random_indexes[-1]) != 2:
             logger.error(f'[Account Loader] Found not closed random account on line {random_indexes[-1][0] + 1}')
             return False
 
         for start_index, end_index in reversed(random_indexes):
-            difference = end_index - start_index - 1
-            if difference:
-                accounts[start_index:end_index + 1] = random.sample(accounts[start_index + 1:end_index], difference)
-            else:
-                accounts[start_index:end_index + 1] = []
+            random_accounts = accounts[start_index + 1:end_index]
+            random.shuffle(random_accounts)
+            accounts[start_index:end_index + 1] = random_accounts
 
     return accounts
@@ -1,5 +1,6 @@
 import json
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import enums
@@ -18,33 +19,50 @@ class Network:
         return f'{self.name} (ID: {self.chain_id})'
 
 
-with open(Path(__file__).parent / 'RPC.json') as file:
-    rpc_list = json.load(file)
+@lru_cache(maxsize=None)
+def _rpc_list() -> dict:
+    with open(Path(__file__).parent / 'RPC.json') as file:
+        return json.load(file)
 
-with open(Path(__file__).parent / 'MaxGwei.json') as file:
-    max_gwei = json.load(file)
 
-NETWORKS = {
-    enums.NetworkNames.ETH: Network(
-        chain_id=1,
-        name='Ethereum Mainnet',
-        rpc_url=rpc_list.get(
-            enums.NetworkNames.ETH.name,
-            'https://rpc.ankr.com/eth'
-        ),
-        txn_explorer_url='https://etherscan.io/tx/',
-        max_gwei=max_gwei.get(enums.NetworkNames.ETH.name, None),
-        rabby_id='eth'
-    ),
-    enums.NetworkNames.Scroll: Network(
-        chain_id=534352,
-        name='Scroll',
-        rpc_url=rpc_list.get(
-            enums.NetworkNames.Scroll.name,
-            'https://rpc.ankr.com/scroll'
+@lru_cache(maxsize=None)
+def _max_gwei() -> dict:
+    with open(Path(__file__).parent / 'MaxGwei.json') as file:
+        return json.load(file)
+
+
+@lru_cache(maxsize=None)
+def _networks() -> dict[enums.NetworkNames, Network]:
+    rpc_list = _rpc_list()
+    max_gwei = _max_gwei()
+
+    return {
+        enums.NetworkNames.ETH: Network(
+            chain_id=1,
+            name='Ethereum Mainnet',
+            rpc_url=rpc_list.get(
+                enums.NetworkNames.ETH.name,
+                'https://rpc.ankr.com/eth'
+            ),
+            txn_explorer_url='https://etherscan.io/tx/',
+            max_gwei=max_gwei.get(enums.NetworkNames.ETH.name, None),
+            rabby_id='eth'
         ),
-        txn_explorer_url='https://scrollscan.com/tx/',
-        max_gwei=max_gwei.get(enums.NetworkNames.Scroll.name, None),
-        rabby_id='scrl'
-    )
-}
+        enums.NetworkNames.Scroll: Network(
+            chain_id=534352,
+            name='Scroll',
+            rpc_url=rpc_list.get(
+                enums.NetworkNames.Scroll.name,
+                'https://rpc.ankr.com/scroll'
+            ),
+            txn_explorer_url='https://scrollscan.com/tx/',
+            max_gwei=max_gwei.get(enums.NetworkNames.Scroll.name, None),
+            rabby_id='scrl'
+        )
+    }
+
+
+def __getattr__(name: str):
+    if name == 'NETWORKS':
+        return _networks()
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
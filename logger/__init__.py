@@ -1,4 +1,8 @@
+import atexit
+import queue
 import sys
+import threading
+import time
 from pathlib import Path
 from uuid import uuid4
 
@@ -7,6 +11,9 @@ from telebot import TeleBot
 
 
 class TelegramHandler:
+    MAX_MESSAGE_LENGTH = 4096
+    BATCH_DELAY = 0.5
+
     def __init__(self, token: str, chat_id: int):
         self.bot = TeleBot(token=token)
         self.chat_id = chat_id
@@ -16,28 +23,81 @@ class TelegramHandler:
             text=f'Starting session with ID #{self.session}'
         )
 
+        self._queue = queue.Queue()
+        self._worker_thread = threading.Thread(target=self._worker, daemon=True)
+        self._worker_thread.start()
+        atexit.register(self.close)
+
     def emit(self, log_message: str) -> None:
-        log_entry = f'#{self.session}\n{log_message}'
+        self._queue.put(log_message)
 
-        self.bot.send_message(
-            chat_id=self.chat_id,
-            text=log_entry,
-            disable_web_page_preview=True
-        )
+    def close(self) -> None:
+        self._queue.put(None)
+        self._worker_thread.join(timeout=10)
 
+    def _worker(self) -> None:
+        running = True
 
-fmt = '<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>'
+        while running:
+            log_message = self._queue.get()
+            if log_message is None:
+                break
 
-logger.remove()
+            batch = [log_message]
+            deadline = time.monotonic() + self.BATCH_DELAY
 
-logger.add(
-    sink=sys.stderr,
-    format=fmt,
-    colorize=True
-)
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    log_message = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+                if log_message is None:
+                    running = False
+                    break
+
+                batch.append(log_message)
+
+            self._send_batch(batch)
+
+    def _send_batch(self, batch: list[str]) -> None:
+        header = f'#{self.session}\n'
+        log_entry = header
+
+        for log_message in batch:
+            if len(log_entry) + len(log_message) > self.MAX_MESSAGE_LENGTH and log_entry != header:
+                self._send(log_entry)
+                log_entry = header
+            log_entry += log_message[:self.MAX_MESSAGE_LENGTH - len(header)]
+
+        self._send(log_entry)
+
+    def _send(self, log_entry: str) -> None:
+        try:
+            self.bot.send_message(
+                chat_id=self.chat_id,
+                text=log_entry,
+                disable_web_page_preview=True
+            )
+        except Exception as e:
+            print(f'Failed to send log message to Telegram: {e}', file=sys.stderr)
+
+
+fmt = '<green>{time:YYYY-MM-DD HH:mm:ss}</green> | <level>{level: <8}</level> | <level>{message}</level>'
+
+LOG_PATH = Path(__file__).parents[1] / 'logs' / 'scroll_canvas.log'
 
-logger.add(
-    Path(__file__).parents[1] / 'logs' / 'scroll_canvas.log',
-    rotation='1 day',
-    format=fmt
+logger.configure(
+    handlers=[
+        {
+            'sink': sys.stderr,
+            'format': fmt,
+            'colorize': True
+        },
+        {
+            'sink': LOG_PATH,
+            'rotation': '1 day',
+            'format': fmt
+        }
+    ]
 )
@@ -1,14 +1,19 @@
-import json
+import argparse
+import secrets
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from pathlib import Path
 
 import eth_abi
+import orjson
 import requests
 from eth_account import Account
 from eth_account.signers.local import LocalAccount
 from hexbytes import HexBytes
-from pydantic import BaseModel, Field, validator
 from web3 import Web3
+from web3.contract import Contract
 
 import accounts_loader
 import constants
@@ -18,6 +23,8 @@ from logger import logger
 
 USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36'
 
+BADGE_REQUEST_WORKERS = 16
+
 
 class ContractTypes(enums.AutoEnum):
     ProfileRegistry = enums.auto()
@@ -42,103 +49,238 @@ CONTRACT_ADRESSES = {
 }
 
 
-class MintInfo(BaseModel):
+@dataclass(slots=True)
+class MintInfo:
     address: str
     data: str
 
 
-class Badge(BaseModel):
+@dataclass(slots=True)
+class Badge:
     name: str
-    base_url: str = Field(alias='baseUrl')
-    contract_address: str = Field(alias='badgeContract')
+    base_url: str
+    contract_address: str
     description: str
     mint_info: MintInfo = None
 
-    class Config:
-        allow_population_by_field_name = True
-
-    @validator('contract_address')
-    def validate_contract_address(cls, v):
-        return Web3.to_checksum_address(v)
+    @classmethod
+    def from_dict(cls, badge: dict) -> 'Badge':
+        return cls(
+            name=badge['name'],
+            base_url=badge['baseUrl'],
+            contract_address=Web3.to_checksum_address(badge['badgeContract']),
+            description=badge['description']
+        )
 
 
 MINT_FEE = 1000000000000000
 
+RANDOM_USERNAME_BATCH_SIZE = 50
+
+GAS_ESTIMATE_MAX_AGE = 10
+
+CLAIMED_BADGES_PATH = Path('claimed_badges.json')
+CLAIMED_BADGES_LOCK = threading.Lock()
+
+ABI_DIR = Path(__file__).resolve().parent / 'abi'
+
+
+def load_abi(name: str) -> str:
+    with open(ABI_DIR / name) as file:
+        return file.read()
+
+
+EAS_ABI = load_abi('EAS.json')
+PROFILE_REGISTRY_ABI = load_abi('ProfileRegistry.json')
+SCROLL_ORIGINS_NFT_ABI = load_abi('ScrollOriginsNFT.json')
+
+HAS_BADGE_SELECTOR = bytes(Web3.keccak(text='hasBadge(address)')[:4])
+
+SCROLL_ORIGINS_SCHEMA = HexBytes('0xd57de4f41c3d3cc855eadef68f98c0d4edd22d57161d96b7c06d2f4336cc3b49')
+ZERO_REF_UID = HexBytes(bytes(32))
+SCROLL_ORIGINS_ATTESTATION_PREFIXES = {
+    network_name: eth_abi.encode(
+        ['address', 'uint256', 'uint256', 'address'],
+        [
+            scroll_origins_badge_address,
+            0x40,
+            0x40,
+            CONTRACT_ADRESSES[ContractTypes.ScrollOriginsNFT][network_name]
+        ]
+    )
+    for network_name, scroll_origins_badge_address in CONTRACT_ADRESSES[ContractTypes.ScrollOriginsBadge].items()
+}
+
+
+def encode_address_call(selector: bytes, address: str) -> str:
+    return '0x' + (selector + bytes(12) + bytes.fromhex(address[2:])).hex()
+
+
 CUSTOM_BADGES = [
     Badge(
         name='Ethereum Year',
         base_url='https://canvas.scroll.cat/badge',
-        contract_address='0x3dacAd961e5e2de850F5E027c70b56b5Afa5DfeD',
+        contract_address=Web3.to_checksum_address('0x3dacAd961e5e2de850F5E027c70b56b5Afa5DfeD'),
         description="Check out the Ethereum Year Badge! It's like a digital trophy that shows off the year your wallet made its debut on Ethereum. It's a little present from Scroll to celebrate all the cool stuff you've done in the Ethereum ecosystem."
     )
 ]
 
 
-def get_eligible_badges(
-    web3: Web3,
-    address: str,
-    proxy: dict[str, str]
-) -> list[Badge]:
-    logger.info(f'[Scroll Canvas] Fetching eligible badges')
+def fetch_badgelist(proxy: dict[str, str]) -> list[dict]:
+    badgelist = getattr(fetch_badgelist, 'badgelist', None)
 
-    headers = {
-        'User-Agent': USER_AGENT
-    }
+    if badgelist is not None:
+        return badgelist
 
-    badgelist_response = requests.get(
+    badgelist_response = utils.SESSION.get(
         'https://raw.githubusercontent.com/scroll-tech/canvas-badges/main/scroll.badgelist.json',
-        headers=headers,
+        headers={
+            'User-Agent': USER_AGENT
+        },
         timeout=5,
         proxies=proxy
     )
 
     if not badgelist_response.ok:
         logger.error(f'[Scroll Canvas] Failed to get the badge list: {badgelist_response.status_code} - {badgelist_response.text}')
+        return None
+
+    badgelist = [
+        badge
+        for badge in orjson.loads(badgelist_response.content)['badges']
+        if 'baseUrl' in badge
+    ]
+
+    fetch_badgelist.badgelist = badgelist
+
+    return badgelist
+
+
+def read_claimed_badges() -> dict[str, list[str]]:
+    with CLAIMED_BADGES_LOCK:
+        claimed_badges = getattr(read_claimed_badges, 'claimed_badges', None)
+
+        if claimed_badges is None:
+            if CLAIMED_BADGES_PATH.exists():
+                with open(CLAIMED_BADGES_PATH, 'rb') as file:
+                    claimed_badges = orjson.loads(file.read())
+            else:
+                claimed_badges = {}
+
+            read_claimed_badges.claimed_badges = claimed_badges
+
+        return claimed_badges
+
+
+def mark_badges_claimed(
+    address: str,
+    contract_addresses: list[str]
+):
+    if not contract_addresses:
         return
 
-    badgelist: list[dict] = badgelist_response.json()['badges']
+    claimed_badges = read_claimed_badges()
 
-    badgelist = list(filter(lambda badge: 'baseUrl' in badge, badgelist))
+    with CLAIMED_BADGES_LOCK:
+        account_badges = claimed_badges.setdefault(address, [])
+        account_badges.extend(
+            contract_address
+            for contract_address in contract_addresses
+            if contract_address not in account_badges
+        )
 
-    badgelist: list[Badge] = [Badge(**badge) for badge in badgelist]
+        with open(CLAIMED_BADGES_PATH, 'wb') as file:
+            file.write(orjson.dumps(claimed_badges, option=orjson.OPT_INDENT_2))
 
-    badgelist: list[Badge] = CUSTOM_BADGES + badgelist
+
+def request_badge_endpoint(
+    badge: Badge,
+    endpoint: str,
+    address: str,
+    proxy: dict[str, str]
+) -> requests.Response | requests.exceptions.RequestException:
+    try:
+        return utils.SESSION.get(
+            f'{badge.base_url}/{endpoint}',
+            params={
+                'badge': badge.contract_address,
+                'recipient': address
+            },
+            headers={
+                'User-Agent': USER_AGENT
+            },
+            timeout=5,
+            proxies=proxy
+        )
+    except requests.exceptions.RequestException as e:
+        return e
+
+
+def get_eligible_badges(
+    web3: Web3,
+    address: str,
+    proxy: dict[str, str]
+) -> list[Badge]:
+    logger.info(f'[Scroll Canvas] Fetching eligible badges')
+
+    badgelist = fetch_badgelist(proxy)
+
+    if badgelist is None:
+        return
+
+    badgelist: list[Badge] = [Badge.from_dict(badge) for badge in badgelist]
+
+    badgelist: list[Badge] = [replace(badge) for badge in CUSTOM_BADGES] + badgelist
 
     logger.info(f'[Scroll Canvas] Fetched {len(badgelist)} badges, checking eligibility')
 
     mintable_badges = []
 
-    with open(Path(__file__).parent / 'abi' / 'Badge.json') as file:
-        badge_abi = file.read()
+    claimed_badges = set(read_claimed_badges().get(address, []))
+    unknown_badges = []
 
     for badge in badgelist:
-        badge_contract = web3.eth.contract(
-            address=Web3.to_checksum_address(badge.contract_address),
-            abi=badge_abi
-        )
+        if badge.contract_address in claimed_badges:
+            logger.info(f'[Scroll Canvas] {badge.name} badge is already claimed')
+        else:
+            unknown_badges.append(badge)
+
+    has_badge_data = encode_address_call(HAS_BADGE_SELECTOR, address)
+
+    has_badge_results = utils.batch_rpc_request(
+        web3,
+        [
+            ('eth_call', [{'to': badge.contract_address, 'data': has_badge_data}, 'latest'])
+            for badge in unknown_badges
+        ]
+    )
 
-        if badge_contract.functions.hasBadge(address).call():
+    unclaimed_badges = []
+    newly_claimed_badges = []
+
+    for badge, has_badge_result in zip(unknown_badges, has_badge_results):
+        if int(has_badge_result, 16):
             logger.info(f'[Scroll Canvas] {badge.name} badge is already claimed')
+            newly_claimed_badges.append(badge.contract_address)
             continue
 
-        request_params = {
-            'badge': badge.contract_address,
-            'recipient': address
-        }
+        unclaimed_badges.append(badge)
 
-        try:
-            check_response = requests.get(
-                f'{badge.base_url}/check',
-                params=request_params,
-                headers=headers,
-                timeout=5,
-                proxies=proxy
-            )
-        except requests.exceptions.RequestException as e:
-            logger.warning(f'[Scroll Canvas] Failed to check eligibility for {badge.name} badge. Usually this is okay')
-        else:
-            if check_response.ok:
-                check_json = check_response.json()
+    mark_badges_claimed(address, newly_claimed_badges)
+
+    with ThreadPoolExecutor(max_workers=BADGE_REQUEST_WORKERS) as executor:
+        check_responses = list(executor.map(
+            lambda badge: request_badge_endpoint(badge, 'check', address, proxy),
+            unclaimed_badges
+        ))
+
+        server_claim_badges = []
+
+        for badge, check_response in zip(unclaimed_badges, check_responses):
+            if isinstance(check_response, requests.exceptions.RequestException):
+                logger.warning(f'[Scroll Canvas] Failed to check eligibility for {badge.name} badge. Usually this is okay')
+            elif check_response.ok:
+                check_json = orjson.loads(check_response.content)
 
                 message = check_json.get('message', '')
                 eligible = check_json.get('eligibility', False)
@@ -146,46 +288,133 @@ def get_eligible_badges(
                 if eligible:
                     logger.success(f'[Scroll Canvas] Account is eligible for {badge.name} badge')
 
-                    try:
-                        claim_response = requests.get(
-                            f'{badge.base_url}/claim',
-                            params=request_params,
-                            headers=headers,
-                            timeout=5,
-                            proxies=proxy
-                        )
-                    except requests.exceptions.RequestException as e:
-                        logger.error(f'[Scroll Canvas] Failed to get claim data for {badge.name} badge')
-                    else:
-                        claim_json = claim_response.json()
-
-                        claim_tx = claim_json['tx']
-
-                        if claim_response.ok:
-                            badge.mint_info = MintInfo(
-                                address=Web3.to_checksum_address(claim_tx['to']),
-                                data=claim_tx['data']
-                            )
-
-                            mintable_badges.append(badge)
-                        else:
-                            logger.error(f'[Scroll Canvas] Failed to get claim data for {badge.name} badge: {claim_response.status_code} - {claim_response.text}')
+                    server_claim_badges.append(badge)
                 else:
                     logger.info(f'[Scroll Canvas] Account is not eligible for {badge.name} badge: {message}')
                     logger.info(f'[Scroll Canvas] Requirement: {badge.description}')
             else:
                 logger.error(f'[Scroll Canvas] Failed to check eligibility for {badge.name} badge: {check_response.status_code} - {check_response.text}')
 
+        claim_responses = list(executor.map(
+            lambda badge: request_badge_endpoint(badge, 'claim', address, proxy),
+            server_claim_badges
+        ))
+
+    for badge, claim_response in zip(server_claim_badges, claim_responses):
+        if isinstance(claim_response, requests.exceptions.RequestException):
+            logger.error(f'[Scroll Canvas] Failed to get claim data for {badge.name} badge')
+            continue
+
+        claim_json = orjson.loads(claim_response.content)
+
+        claim_tx = claim_json['tx']
+
+        if claim_response.ok:
+            badge.mint_info = MintInfo(
+                address=Web3.to_checksum_address(claim_tx['to']),
+                data=claim_tx['data']
+            )
+
+            mintable_badges.append(badge)
+        else:
+            logger.error(f'[Scroll Canvas] Failed to get claim data for {badge.name} badge: {claim_response.status_code} - {claim_response.text}')
+
     return mintable_badges
 
 
+def generate_username(
+    web3: Web3,
+    profile_registry_contract: Contract,
+    proxy: dict[str, str]
+) -> str:
+    while True:
+        candidates = []
+
+        try:
+            user_response = utils.SESSION.get(
+                f'https://randomuser.me/api/?results={RANDOM_USERNAME_BATCH_SIZE}',
+                headers={
+                    'User-Agent': USER_AGENT
+                },
+                timeout=5,
+                proxies=proxy
+            )
+        except requests.exceptions.RequestException as e:
+            logger.error(f'[Scroll Canvas] Failed to get random username: {e}')
+        else:
+            if user_response.ok:
+                candidates = [
+                    user['login']['username']
+                    for user in orjson.loads(user_response.content)['results']
+                ]
+            else:
+                logger.error(f'[Scroll Canvas] Failed to get random username: {user_response.status_code} - {user_response.text}')
+
+        candidates = [candidate for candidate in candidates if utils.check_username(candidate)]
+
+        if not candidates:
+            candidates = [
+                f'user_{secrets.token_hex(4)}'
+                for _ in range(RANDOM_USERNAME_BATCH_SIZE)
+            ]
+
+        username_used_results = utils.batch_rpc_request(
+            web3,
+            [
+                (
+                    'eth_call',
+                    [
+                        {
+                            'to': profile_registry_contract.address,
+                            'data': profile_registry_contract.encodeABI(fn_name='isUsernameUsed', args=[candidate])
+                        },
+                        'latest'
+                    ]
+                )
+                for candidate in candidates
+            ]
+        )
+
+        for candidate, username_used_result in zip(candidates, username_used_results):
+            if not int(username_used_result, 16):
+                return candidate
+
+
+def suggest_gas_fees_and_estimate_gas(
+    web3: Web3,
+    txn: dict,
+    network_name: enums.NetworkNames,
+    proxy: dict[str, str]
+) -> tuple[dict, int, int]:
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        gas_price_future = executor.submit(
+            utils.suggest_gas_fees,
+            network_name=network_name,
+            proxy=proxy
+        )
+
+        gas = utils.estimate_gas(web3, txn)
+        balance = web3.eth.get_balance(txn['from'])
+        sampled_at = time.monotonic()
+
+        gas_price = gas_price_future.result()
+
+    if time.monotonic() - sampled_at > GAS_ESTIMATE_MAX_AGE:
+        gas = utils.estimate_gas(web3, txn)
+        balance = web3.eth.get_balance(txn['from'])
+
+    return gas_price, gas, balance
+
+
 def register_and_claim(
     private_key: str,
     network_name: enums.NetworkNames,
     username: str,
     invite_code: str,
     claim_badges: bool,
-    proxy: dict[str, str]
+    proxy: dict[str, str],
+    min_sleep_time: float,
+    max_sleep_time: float
 ):
     headers = {
         'User-Agent': USER_AGENT
@@ -194,27 +423,58 @@ def register_and_claim(
     network = constants.NETWORKS[network_name]
 
     web3 = Web3(
-        Web3.HTTPProvider(
+        utils.OrjsonHTTPProvider(
             network.rpc_url,
             request_kwargs={
                 'proxies': proxy
-            }
+            },
+            session=utils.SESSION
         )
     )
 
     account: LocalAccount = Account.from_key(private_key)
 
-    with open(Path(__file__).parent / 'abi' / 'ProfileRegistry.json') as file:
-        profile_registry_abi = file.read()
-
     profile_registry_contract = web3.eth.contract(
         address=CONTRACT_ADRESSES[ContractTypes.ProfileRegistry][network_name],
-        abi=profile_registry_abi
+        abi=PROFILE_REGISTRY_ABI
     )
 
-    profile_address = profile_registry_contract.functions.getProfile(
-        account.address
-    ).call()
+    precheck_calls = [
+        ('eth_getTransactionCount', [account.address, 'pending']),
+        (
+            'eth_call',
+            [
+                {
+                    'to': profile_registry_contract.address,
+                    'data': profile_registry_contract.encodeABI(fn_name='getProfile', args=[account.address])
+                },
+                'latest'
+            ]
+        )
+    ]
+
+    check_username_used = bool(username) and username.lower() != 'random' and utils.check_username(username)
+    if check_username_used:
+        precheck_calls.append(
+            (
+                'eth_call',
+                [
+                    {
+                        'to': profile_registry_contract.address,
+                        'data': profile_registry_contract.encodeABI(fn_name='isUsernameUsed', args=[username])
+                    },
+                    'latest'
+                ]
+            )
+        )
+
+    precheck_results = utils.batch_rpc_request(web3, precheck_calls)
+
+    nonce = int(precheck_results[0], 16)
+    profile_address = Web3.to_checksum_address(
+        eth_abi.decode(['address'], HexBytes(precheck_results[1]))[0]
+    )
+    username_used = check_username_used and bool(int(precheck_results[2], 16))
 
     if profile_registry_contract.functions.isProfileMinted(profile_address).call():
         logger.info(f'[Scroll Canvas] Profile is already minted for {account.address}')
@@ -224,31 +484,17 @@ def register_and_claim(
         if not username or username.lower() == 'random':
             logger.info(f'[Scroll Canvas] Generating random username')
 
-            while True:
-                user_response = requests.get(
-                    'https://randomuser.me/api/',
-                    headers=headers,
-                    timeout=5,
-                    proxies=proxy
-                )
-
-                if user_response.ok:
-                    user_json = user_response.json()
-
-                    username = user_json['results'][0]['login']['username']
-
-                    if utils.check_username(username) and not profile_registry_contract.functions.isUsernameUsed(username).call():
-                        break
-                else:
-                    logger.error(f'[Scroll Canvas] Failed to get random username: {user_response.status_code} - {user_response.text}')
-
-                time.sleep(1)
+            username = generate_username(
+                web3=web3,
+                profile_registry_contract=profile_registry_contract,
+                proxy=proxy
+            )
 
             logger.info(f'[Scroll Canvas] Generated username: {username}')
         elif not utils.check_username(username):
             logger.error(f'[Scroll Canvas] Invalid username: {username}. Must be 4-15 characters long and contain only letters, numbers, and underscores')
             return enums.TransactionStatus.FAILED
-        elif profile_registry_contract.functions.isUsernameUsed(username).call():
+        elif username_used:
             logger.error(f'[Scroll Canvas] Username {username} is already taken')
             return enums.TransactionStatus.FAILED
 
@@ -259,33 +505,38 @@ def register_and_claim(
                 logger.error(f'[Scroll Canvas] Invalid invite code: {invite_code}. Must be 5 uppercase letters or numbers')
                 return enums.TransactionStatus.FAILED
 
-            code_check_response = requests.get(
-                f'https://canvas.scroll.cat/code/{invite_code}/active',
-                headers=headers,
-                proxies=proxy
-            )
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                code_check_future = executor.submit(
+                    utils.SESSION.get,
+                    f'https://canvas.scroll.cat/code/{invite_code}/active',
+                    headers=headers,
+                    proxies=proxy
+                )
+                referral_future = executor.submit(
+                    utils.SESSION.get,
+                    url=f'https://canvas.scroll.cat/code/{invite_code}/sig/{account.address}',
+                    headers=headers,
+                    proxies=proxy
+                )
+
+                code_check_response = code_check_future.result()
+                referral_response = referral_future.result()
 
             if not code_check_response.ok:
                 logger.error(f'[Scroll Canvas] Invalid invite code: {invite_code}')
                 return enums.TransactionStatus.FAILED
 
-            code_check_json = code_check_response.json()
+            code_check_json = orjson.loads(code_check_response.content)
 
             if not code_check_json['active']:
                 logger.error(f'[Scroll Canvas] Invite code {invite_code} is not active')
                 return enums.TransactionStatus.FAILED
 
-            referral_response = requests.get(
-                url=f'https://canvas.scroll.cat/code/{invite_code}/sig/{account.address}',
-                headers=headers,
-                proxies=proxy
-            )
-
             if not referral_response.ok:
                 logger.error(f'[Scroll Canvas] Failed to get mint signature: {referral_response.status_code} - {referral_response.text}')
                 return enums.TransactionStatus.FAILED
 
-            referral_json = referral_response.json()
+            referral_json = orjson.loads(referral_response.content)
 
             referral_signature = HexBytes(referral_json['signature'])
 
@@ -294,30 +545,25 @@ def register_and_claim(
             referral_signature = b''
             mint_fee = MINT_FEE
 
-        gas_price = utils.suggest_gas_fees(
-            network_name=network_name,
-            proxy=proxy
-        )
-
-        if not gas_price:
-            return enums.TransactionStatus.FAILED
-
-        txn = profile_registry_contract.functions.mint(
-            username,
-            referral_signature
-        ).build_transaction(
-            {
-                'chainId': network.chain_id,
-                'nonce': web3.eth.get_transaction_count(account.address),
-                'from': account.address,
-                'value': mint_fee,
-                'gas': 0,
-                **gas_price
-            }
-        )
+        txn = {
+            'chainId': network.chain_id,
+            'nonce': nonce,
+            'from': account.address,
+            'to': profile_registry_contract.address,
+            'data': profile_registry_contract.encodeABI(
+                fn_name='mint',
+                args=[username, referral_signature]
+            ),
+            'value': mint_fee
+        }
 
         try:
-            txn['gas'] = utils.estimate_gas(web3, txn)
+            gas_price, txn['gas'], balance = suggest_gas_fees_and_estimate_gas(
+                web3=web3,
+                txn=txn,
+                network_name=network_name,
+                proxy=proxy
+            )
         except Exception as e:
             if 'insufficient funds' in str(e):
                 logger.critical(f'[Scroll Canvas] Insufficient balance to mint profile')
@@ -325,9 +571,19 @@ def register_and_claim(
             logger.error(f'[Scroll Canvas] Error while estimating gas: {e}')
             return enums.TransactionStatus.FAILED
 
+        if not gas_price:
+            return enums.TransactionStatus.FAILED
+
+        txn.update(gas_price)
+
+        if balance < utils.max_transaction_cost(txn):
+            logger.critical(f'[Scroll Canvas] Insufficient balance to mint profile')
+            return enums.TransactionStatus.INSUFFICIENT_BALANCE
+
         signed_txn = account.sign_transaction(txn)
 
         txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+        nonce += 1
 
         logger.info(f'[Scroll Canvas] Transaction: {network.txn_explorer_url}{txn_hash.hex()}')
 
@@ -343,7 +599,7 @@ def register_and_claim(
             logger.error(f'[Scroll Canvas] Failed to mint profile for {account.address}')
             return enums.TransactionStatus.FAILED
 
-        utils.random_sleep()
+        utils.random_sleep(min_sleep_time, max_sleep_time)
 
     if not claim_badges:
         return enums.TransactionStatus.SUCCESS
@@ -360,76 +616,115 @@ def register_and_claim(
     if eligible_badges:
         logger.info(f'[Scroll Canvas] Claiming {len(eligible_badges)} badges')
 
-        for badge in eligible_badges:
-            gas_price = utils.suggest_gas_fees(
-                network_name=network_name,
-                proxy=proxy
-            )
-
-            if not gas_price:
-                return enums.TransactionStatus.FAILED
+        sent_badges = []
+        claim_txn_hashes = []
+        claim_status = None
+        sent_cost = 0
 
+        for badge in eligible_badges:
             txn = {
                 'chainId': network.chain_id,
-                'nonce': web3.eth.get_transaction_count(account.address),
+                'nonce': nonce,
                 'from': account.address,
                 'to': badge.mint_info.address,
                 'data': badge.mint_info.data,
-                'value': 0,
-                'gas': 0,
-                **gas_price
+                'value': 0
             }
 
             try:
-                txn['gas'] = utils.estimate_gas(web3, txn)
+                gas_price, txn['gas'], balance = suggest_gas_fees_and_estimate_gas(
+                    web3=web3,
+                    txn=txn,
+                    network_name=network_name,
+                    proxy=proxy
+                )
             except Exception as e:
                 if 'insufficient funds' in str(e):
                     logger.critical(f'[Scroll Canvas] Insufficient balance to claim {badge.name} badge')
-                    return enums.TransactionStatus.INSUFFICIENT_BALANCE
-                logger.error(f'[Scroll Canvas] Error while estimating gas: {e}')
-                return enums.TransactionStatus.FAILED
+                    claim_status = enums.TransactionStatus.INSUFFICIENT_BALANCE
+                else:
+                    logger.error(f'[Scroll Canvas] Error while estimating gas: {e}')
+                    claim_status = enums.TransactionStatus.FAILED
+                break
+
+            if not gas_price:
+                claim_status = enums.TransactionStatus.FAILED
+                break
+
+            txn.update(gas_price)
+
+            txn_cost = utils.max_transaction_cost(txn)
+
+            if balance - sent_cost < txn_cost:
+                logger.critical(f'[Scroll Canvas] Insufficient balance to claim {badge.name} badge')
+                claim_status = enums.TransactionStatus.INSUFFICIENT_BALANCE
+                break
 
             signed_txn = account.sign_transaction(txn)
 
-            txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            try:
+                txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            except Exception as e:
+                if 'insufficient funds' in str(e):
+                    logger.critical(f'[Scroll Canvas] Insufficient balance to claim {badge.name} badge')
+                    claim_status = enums.TransactionStatus.INSUFFICIENT_BALANCE
+                else:
+                    logger.error(f'[Scroll Canvas] Failed to send {badge.name} badge claim: {e}')
+                    claim_status = enums.TransactionStatus.FAILED
+                break
+
+            nonce += 1
+            sent_cost += txn_cost
 
             logger.info(f'[Scroll Canvas] Transaction: {network.txn_explorer_url}{txn_hash.hex()}')
 
-            receipt = utils.wait_for_transaction_receipt(
-                web3=web3.eth,
-                txn_hash=txn_hash,
-                logging_prefix='Scroll Canvas'
-            )
+            sent_badges.append(badge)
+            claim_txn_hashes.append(txn_hash)
+
+        receipts = utils.wait_for_transaction_receipts_batch(
+            web3=web3,
+            txn_hashes=claim_txn_hashes,
+            logging_prefix='Scroll Canvas'
+        )
+
+        claims_failed = False
+        claimed_badges = []
 
+        for badge, receipt in zip(sent_badges, receipts):
             if receipt and receipt['status'] == 1:
                 logger.success(f'[Scroll Canvas] Successfully claimed {badge.name} badge')
+                claimed_badges.append(badge.contract_address)
             else:
                 logger.error(f'[Scroll Canvas] Failed to claim {badge.name} badge')
-                return enums.TransactionStatus.FAILED
+                claims_failed = True
+
+        mark_badges_claimed(account.address, claimed_badges)
+
+        if claim_status is not None:
+            return claim_status
 
-            utils.random_sleep()
+        if claims_failed:
+            return enums.TransactionStatus.FAILED
+
+        utils.random_sleep(min_sleep_time, max_sleep_time)
     else:
         logger.info(f'[Scroll Canvas] No badges to claim were found')
 
     logger.info(f'[Scroll Canvas] Checking eligibility for Scroll Origins NFT badge')
 
-    with open(Path(__file__).parent / 'abi' / 'ScrollBadgeTokenOwner.json') as file:
-        scroll_origins_badge_abi = file.read()
+    scroll_origins_badge_address = CONTRACT_ADRESSES[ContractTypes.ScrollOriginsBadge][network_name]
 
-    scroll_badge_contract = web3.eth.contract(
-        address=CONTRACT_ADRESSES[ContractTypes.ScrollOriginsBadge][network_name],
-        abi=scroll_origins_badge_abi
-    )
+    has_origins_badge = web3.eth.call({
+        'to': scroll_origins_badge_address,
+        'data': encode_address_call(HAS_BADGE_SELECTOR, account.address)
+    })
 
-    if scroll_badge_contract.functions.hasBadge(account.address).call():
+    if int.from_bytes(has_origins_badge, 'big'):
         logger.info(f'[Scroll Canvas] Scroll Origins NFT badge is already claimed')
     else:
-        with open(Path(__file__).parent / 'abi' / 'ScrollOriginsNFT.json') as file:
-            scroll_origins_nft_abi = file.read()
-
         scroll_origins_nft_contract = web3.eth.contract(
             address=CONTRACT_ADRESSES[ContractTypes.ScrollOriginsNFT][network_name],
-            abi=scroll_origins_nft_abi
+            abi=SCROLL_ORIGINS_NFT_ABI
         )
 
         if scroll_origins_nft_contract.functions.minted(account.address).call():
@@ -440,58 +735,44 @@ def register_and_claim(
                 0
             ).call()
 
-            with open(Path(__file__).parent / 'abi' / 'EAS.json') as file:
-                attestor_abi = file.read()
-
             attestor_contract = web3.eth.contract(
                 address=CONTRACT_ADRESSES[ContractTypes.ScrollOriginsAttestor][network_name],
-                abi=attestor_abi
-            )
-
-            data = eth_abi.encode(
-                ['address', 'uint256', 'uint256', 'address', 'uint256'],
-                [
-                    scroll_badge_contract.address,
-                    0x40,
-                    0x40,
-                    scroll_origins_nft_contract.address,
-                    nft_id
-                ]
-            )
-
-            gas_price = utils.suggest_gas_fees(
-                network_name=network_name,
-                proxy=proxy
+                abi=EAS_ABI
             )
 
-            if not gas_price:
-                return enums.TransactionStatus.FAILED
+            data = SCROLL_ORIGINS_ATTESTATION_PREFIXES[network_name] + nft_id.to_bytes(32, 'big')
 
-            txn = attestor_contract.functions.attest(
-                (
-                    HexBytes('0xd57de4f41c3d3cc855eadef68f98c0d4edd22d57161d96b7c06d2f4336cc3b49'),
-                    (
-                        account.address,
-                        0,
-                        False,
-                        HexBytes(f'0x{"00" * 32}'),
-                        data,
-                        0
-                    )
-                )
-            ).build_transaction(
-                {
-                    'chainId': network.chain_id,
-                    'nonce': web3.eth.get_transaction_count(account.address),
-                    'from': account.address,
-                    'value': 0,
-                    'gas': 0,
-                    **gas_price
-                }
-            )
+            txn = {
+                'chainId': network.chain_id,
+                'nonce': nonce,
+                'from': account.address,
+                'to': attestor_contract.address,
+                'data': attestor_contract.encodeABI(
+                    fn_name='attest',
+                    args=[
+                        (
+                            SCROLL_ORIGINS_SCHEMA,
+                            (
+                                account.address,
+                                0,
+                                False,
+                                ZERO_REF_UID,
+                                data,
+                                0
+                            )
+                        )
+                    ]
+                ),
+                'value': 0
+            }
 
             try:
-                txn['gas'] = utils.estimate_gas(web3, txn)
+                gas_price, txn['gas'], balance = suggest_gas_fees_and_estimate_gas(
+                    web3=web3,
+                    txn=txn,
+                    network_name=network_name,
+                    proxy=proxy
+                )
             except Exception as e:
                 if 'insufficient funds' in str(e):
                     logger.critical(f'[Scroll Canvas] Insufficient balance to claim Scroll Origins NFT badge')
@@ -499,9 +780,19 @@ def register_and_claim(
                 logger.error(f'[Scroll Canvas] Error while estimating gas: {e}')
                 return enums.TransactionStatus.FAILED
 
+            if not gas_price:
+                return enums.TransactionStatus.FAILED
+
+            txn.update(gas_price)
+
+            if balance < utils.max_transaction_cost(txn):
+                logger.critical(f'[Scroll Canvas] Insufficient balance to claim Scroll Origins NFT badge')
+                return enums.TransactionStatus.INSUFFICIENT_BALANCE
+
             signed_txn = account.sign_transaction(txn)
 
             txn_hash = web3.eth.send_raw_transaction(signed_txn.rawTransaction)
+            nonce += 1
 
             logger.info(f'[Scroll Canvas] Transaction: {network.txn_explorer_url}{txn_hash.hex()}')
 
@@ -522,143 +813,191 @@ def register_and_claim(
     return enums.TransactionStatus.SUCCESS
 
 
-def run_accounts(bot_accounts: list[accounts_loader.BotAccount]):
+def process_account(bot_account: accounts_loader.BotAccount) -> bool:
+    logger.info(f'Processing account with private_key {bot_account.short_private_key}')
+
+    if bot_account.mobile_proxy_changelink:
+        response = utils.NO_RETRY_SESSION.get(bot_account.mobile_proxy_changelink)
+        if response.status_code == 200:
+            logger.info(f'[Main] Changed mobile proxy for account with private_key {bot_account.short_private_key}: {response.text}')
+            utils.sleep(5)
+        else:
+            logger.warning(f'[Main] Failed to change mobile proxy for account with private_key {bot_account.short_private_key}: {response.text}')
+
+    if bot_account.proxy:
+        proxy_error = False
+        attempt = 0
+
+        while True:
+            try:
+                proxy_test_result = utils.test_proxy(bot_account.proxy)
+                if isinstance(proxy_test_result, str):
+                    logger.info(f'[Main] Outgoing IP for account with private_key {bot_account.short_private_key} - {proxy_test_result}')
+                    break
+                elif proxy_test_result:
+                    logger.warning(f'[Main] Failed to get outgoing IP for account with private_key {bot_account.short_private_key}')
+                    break
+                else:
+                    logger.error(f'[Main] Proxy specified for account with private_key {bot_account.short_private_key} is not working. Retrying...')
+                    logger.info(f'[Main] To stop retrying, press Ctrl+C')
+                    if utils.interruptible_sleep(utils.backoff_sleep_time(attempt)):
+                        proxy_error = True
+                        break
+                    attempt += 1
+            except KeyboardInterrupt:
+                proxy_error = True
+                break
+
+        if proxy_error:
+            proxy_result = utils.prompt(
+                '[Main] What to do? (possible options: [s]kip, [e]xit, [d]elete (deletes proxy)): '
+            )
+            if proxy_result.lower() in {'s', 'skip'}:
+                logger.warning(f'[Main] Skipping account with private_key {bot_account.short_private_key}')
+                return True
+            elif proxy_result.lower() in {'e', 'exit'}:
+                logger.error(f'[Main] Exiting session due to incorrect proxy')
+                return False
+            else:
+                logger.info(f'[Main] Deleting proxy for account with private_key {bot_account.short_private_key}')
+                bot_account.proxy = None
+
+    while True:
+        success = False
+
+        for i in range(max(1, bot_account.max_retries)):
+            result = register_and_claim(
+                private_key=bot_account.private_key,
+                network_name=enums.NetworkNames.Scroll,
+                username=bot_account.username,
+                invite_code=bot_account.invite_code,
+                claim_badges=bot_account.claim_badges,
+                proxy=bot_account.proxy,
+                min_sleep_time=bot_account.min_sleep_time,
+                max_sleep_time=bot_account.max_sleep_time
+            )
+
+            if result == enums.TransactionStatus.SUCCESS:
+                success = True
+                break
+
+            if i < bot_account.max_retries - 1:
+                utils.random_sleep(bot_account.min_sleep_time, bot_account.max_sleep_time)
+        else:
+            logger.error(f'[Main] Failed to process account with private_key {bot_account.short_private_key}')
+
+            if not bot_account.auto_skip:
+                answer = utils.prompt('[Main] What to do? (possible options: [s]kip, [e]xit, [r]etry): ')
+
+                if answer.lower() in {'s', 'skip'}:
+                    logger.warning(f'[Main] Skipping account with private_key {bot_account.short_private_key}')
+                    break
+                elif answer.lower() in {'e', 'exit'}:
+                    logger.error(f'[Main] Exiting session due to failed transaction')
+                    return False
+                else:
+                    logger.info(f'[Main] Retrying account with private_key {bot_account.short_private_key}')
+                    utils.random_sleep(bot_account.min_sleep_time, bot_account.max_sleep_time)
+
+        if success:
+            break
+
+    logger.info(f'[Main] Finished account with private_key {bot_account.short_private_key}')
+
+    return True
+
+
+def process_account_unless_stopped(
+    bot_account: accounts_loader.BotAccount,
+    stop_event: threading.Event
+):
+    if stop_event.is_set():
+        return
+
+    try:
+        if not process_account(bot_account):
+            stop_event.set()
+    except Exception:
+        logger.exception(f'[Main] Unexpected error while processing account with private_key {bot_account.short_private_key}')
+        stop_event.set()
+
+
+def run_accounts(
+    bot_accounts: list[accounts_loader.BotAccount],
+    concurrency: int = 1
+):
     if not bot_accounts:
         return
 
     accounts_hashes = [bot_account.hash for bot_account in bot_accounts]
 
     if Path('last_state.json').exists():
-        with open('last_state.json', 'r') as file:
-            last_state = json.load(file)
+        with open('last_state.json', 'rb') as file:
+            last_state = orjson.loads(file.read())
 
         order = last_state.get('order', [])
 
         if sorted(order) == sorted(accounts_hashes):
+            bot_accounts_by_hash = {bot_account.hash: bot_account for bot_account in bot_accounts}
             last_bot_index = order.index(last_state['account_hash'])
-            last_bot_account = next(
-                filter(
-                    lambda bot_account: bot_account.hash == last_state['account_hash'],
-                    bot_accounts
-                )
-            )
+            last_bot_account = bot_accounts_by_hash[last_state['account_hash']]
 
             continue_result = input(f'[Main] Continue account with private_key {last_bot_account.short_private_key}? [y/n]: ')
             if continue_result.lower() == 'y':
-                bot_accounts = [bot_accounts[accounts_hashes.index(account_hash)] for account_hash in order]
-                accounts_hashes = [bot_account.hash for bot_account in bot_accounts]
+                bot_accounts = [bot_accounts_by_hash[account_hash] for account_hash in order]
+                accounts_hashes = order
                 bot_accounts = bot_accounts[last_bot_index + 1:]
                 bot_accounts.insert(0, last_bot_account)
                 logger.info(f'[Main] Continuing account with private_key {last_bot_account.short_private_key}')
 
-    with open('last_state.json', 'w') as file:
-        json.dump(
+    with open('last_state.json', 'wb') as file:
+        file.write(orjson.dumps(
             {
                 'order': accounts_hashes,
                 'account_hash': bot_accounts[0].hash
             },
-            file,
-            indent=4
-        )
+            option=orjson.OPT_INDENT_2
+        ))
 
     logger.info(f'Accounts order: {" -> ".join(bot_account.short_private_key for bot_account in bot_accounts)}')
 
-    for bot_account in bot_accounts:
-        logger.info(f'Processing account with private_key {bot_account.short_private_key}')
-
-        utils.random_sleep.min_sleep_time = bot_account.min_sleep_time
-        utils.random_sleep.max_sleep_time = bot_account.max_sleep_time
-
-        if bot_account.mobile_proxy_changelink:
-            response = requests.get(bot_account.mobile_proxy_changelink)
-            if response.status_code == 200:
-                logger.info(f'[Main] Changed mobile proxy for account with private_key {bot_account.short_private_key}: {response.text}')
-                utils.sleep(5)
-            else:
-                logger.warning(f'[Main] Failed to change mobile proxy for account with private_key {bot_account.short_private_key}: {response.text}')
-
-        if bot_account.proxy:
-            proxy_error = False
-
-            while True:
-                try:
-                    proxy_test_result = utils.test_proxy(bot_account.proxy)
-                    if isinstance(proxy_test_result, str):
-                        logger.info(f'[Main] Outgoing IP for account with private_key {bot_account.short_private_key} - {proxy_test_result}')
-                        break
-                    elif proxy_test_result:
-                        logger.warning(f'[Main] Failed to get outgoing IP for account with private_key {bot_account.short_private_key}')
-                        break
-                    else:
-                        logger.error(f'[Main] Proxy specified for account with private_key {bot_account.short_private_key} is not working. Retrying...')
-                        logger.info(f'[Main] To stop retrying, press Ctrl+C')
-                        utils.time.sleep(15)
-                except KeyboardInterrupt:
-                    proxy_error = True
-                    break
-
-            if proxy_error:
-                proxy_result = input(
-                    '[Main] What to do? (possible options: [s]kip, [e]xit, [d]elete (deletes proxy)): '
-                )
-                if proxy_result.lower() in {'s', 'skip'}:
-                    logger.warning(f'[Main] Skipping account with private_key {bot_account.short_private_key}')
-                    continue
-                elif proxy_result.lower() in {'e', 'exit'}:
-                    logger.error(f'[Main] Exiting session due to incorrect proxy')
-                    break
-                else:
-                    logger.info(f'[Main] Deleting proxy for account with private_key {bot_account.short_private_key}')
-                    bot_account.proxy = None
-
-        while True:
-            success = False
-
-            for i in range(max(1, bot_account.max_retries)):
-                result = register_and_claim(
-                    private_key=bot_account.private_key,
-                    network_name=enums.NetworkNames.Scroll,
-                    username=bot_account.username,
-                    invite_code=bot_account.invite_code,
-                    claim_badges=bot_account.claim_badges,
-                    proxy=bot_account.proxy
-                )
-
-                if result == enums.TransactionStatus.SUCCESS:
-                    success = True
-                    break
-
-                if i < bot_account.max_retries - 1:
-                    utils.random_sleep()
-            else:
-                logger.error(f'[Main] Failed to process account with private_key {bot_account.short_private_key}')
-
-                if not bot_account.auto_skip:
-                    answer = input('[Main] What to do? (possible options: [s]kip, [e]xit, [r]etry): ')
-
-                    if answer.lower() in {'s', 'skip'}:
-                        logger.warning(f'[Main] Skipping account with private_key {bot_account.short_private_key}')
-                        break
-                    elif answer.lower() in {'e', 'exit'}:
-                        logger.error(f'[Main] Exiting session due to failed transaction')
-                        return
-                    else:
-                        logger.info(f'[Main] Retrying account with private_key {bot_account.short_private_key}')
-                        utils.random_sleep()
-
-            if success:
+    if concurrency <= 1:
+        for bot_account in bot_accounts:
+            if not process_account(bot_account):
                 break
+    else:
+        stop_event = threading.Event()
 
-        logger.info(f'[Main] Finished account with private_key {bot_account.short_private_key}')
+        with utils.sigint_to_workers(stop_event), ThreadPoolExecutor(max_workers=concurrency) as executor:
+            try:
+                list(executor.map(
+                    lambda bot_account: process_account_unless_stopped(bot_account, stop_event),
+                    bot_accounts
+                ))
+            except KeyboardInterrupt:
+                logger.warning('[Main] Stopping: no new accounts will be started, waiting for running accounts to finish')
+                executor.shutdown(wait=False, cancel_futures=True)
+                raise
 
 
 def main():
+    parser = argparse.ArgumentParser(description='Scroll Canvas Bot')
+    parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=1,
+        help='number of accounts processed in parallel (default: 1)'
+    )
+    args = parser.parse_args()
+
     logger.info(f'Scroll Canvas Bot started')
 
+    utils.install_dns_cache()
+
     bot_accounts = accounts_loader.read_accounts()
 
     if isinstance(bot_accounts, list):
-        run_accounts(bot_accounts)
+        run_accounts(bot_accounts, concurrency=args.concurrency)
 
 
 if __name__ == '__main__':
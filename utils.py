@@ -1,66 +1,275 @@
-import datetime as dt
+import http.client
 import random
 import re
+import signal
+import socket
+import string
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Callable, Mapping, NamedTuple
 
+import numpy as np
+import orjson
 import requests
 from eth_typing.encoding import HexStr
 from eth_typing.evm import Hash32
 from hexbytes.main import HexBytes
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from web3 import Web3
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
 from web3.eth.eth import Eth
-from web3.types import TxReceipt
+from web3.exceptions import TransactionNotFound
+from web3.providers import HTTPProvider
+from web3.types import RPCEndpoint, RPCResponse, TxReceipt
 
 import constants
 import enums
 from logger import logger
 
+_USERNAME_RE = re.compile(r'[A-Za-z0-9_]{4,15}\Z')
+_INVITE_CODE_CHARS = frozenset(string.ascii_uppercase + string.digits)
+
+SESSION = requests.Session()
+SESSION.headers.update({'Connection': 'keep-alive'})
+SESSION_ADAPTER = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(total=3, backoff_factor=0.3)
+)
+SESSION.mount('http://', SESSION_ADAPTER)
+SESSION.mount('https://', SESSION_ADAPTER)
+
+# Proxy probes and other non-idempotent or fail-fast requests must not be retried
+NO_RETRY_SESSION = requests.Session()
+NO_RETRY_SESSION.mount('http://', HTTPAdapter(max_retries=0))
+NO_RETRY_SESSION.mount('https://', HTTPAdapter(max_retries=0))
+
+PROXY_TEST_TIMEOUT = 5
+
+_METAMASK_GAS_HOST = 'gas-api.metaswap.codefi.network'
+_RABBY_HOST = 'api.rabby.io'
+_RABBY_PATH_TMPL = '/v1/wallet/gas_market?chain_id={}'
+_RABBY_HEADERS = {
+    'X-Api-Ver': 'v2',
+    'X-Client': 'Rabby',
+    'X-Version': '0.92.52',
+    'X-Api-Nonce': 'n_0LknmB7aJePWhQezXR3SFQeLmf0Q3wDDnSpgDJxS',
+    'X-Api-Sign': '058c4e73eb35b19a57ffca66643937e447dcacd9a3c653df774fb7c45e328462',
+    'X-Api-Ts': '1709038705'
+}
+_direct_connections: dict[str, http.client.HTTPSConnection] = {}
+_rabby_last_responses: dict[enums.NetworkNames, tuple[str, dict]] = {}
+
+_GWEI = 1_000_000_000
+
+DNS_CACHE_TTL = 300
+_dns_cache: dict[tuple, tuple[list, float]] = {}
+_getaddrinfo = socket.getaddrinfo
+
+GAS_CACHE_TTL = 10
+_gas_cache: dict[enums.NetworkNames, tuple[dict, float]] = {}
+_gas_fees_lock = threading.RLock()
+
+_sleep_interrupted = threading.Event()
+_workers_stop_event: threading.Event | None = None
+_sleeping_threads = 0
+_sleeping_threads_lock = threading.Lock()
+_prompt_lock = threading.Lock()
+
+SLEEP_BUFFER_SIZE = 1024
+_rng = np.random.default_rng()
+_sleep_buffers: dict[tuple[float, float], list[float]] = {}
+_sleep_buffer_lock = threading.Lock()
+
+
+def _cached_getaddrinfo(host, port, family=0, type=0, proto=0, flags=0):
+    cache_key = (host, port, family, type, proto, flags)
+    cached = _dns_cache.get(cache_key)
+    if cached and time.monotonic() < cached[1]:
+        return cached[0]
+
+    result = _getaddrinfo(host, port, family, type, proto, flags)
+    _dns_cache[cache_key] = (result, time.monotonic() + DNS_CACHE_TTL)
+    return result
+
+
+def _warm_dns_cache():
+    for host in (_RABBY_HOST, _METAMASK_GAS_HOST):
+        try:
+            socket.getaddrinfo(host, 443, 0, socket.SOCK_STREAM)
+        except OSError:
+            pass
+
+
+def install_dns_cache():
+    if socket.getaddrinfo is _cached_getaddrinfo:
+        return
+
+    socket.getaddrinfo = _cached_getaddrinfo
+    threading.Thread(target=_warm_dns_cache, daemon=True).start()
+
+
+def _orjson_default(obj):
+    if isinstance(obj, AttributeDict):
+        return dict(obj)
+    if isinstance(obj, bytes):
+        return Web3.to_hex(obj)
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class OrjsonHTTPProvider(HTTPProvider):
+    def encode_rpc_request(self, method: RPCEndpoint, params) -> bytes:
+        try:
+            return orjson.dumps(
+                {
+                    'jsonrpc': '2.0',
+                    'method': method,
+                    'params': params or [],
+                    'id': next(self.request_counter)
+                },
+                default=_orjson_default
+            )
+        except TypeError:
+            return super().encode_rpc_request(method, params)
+
+    def decode_rpc_response(self, raw_response: bytes) -> RPCResponse:
+        return orjson.loads(raw_response)
+
+
+def _handle_sigint(signum, frame):
+    if _sleeping_threads and not _sleep_interrupted.is_set():
+        _sleep_interrupted.set()
+        return
+
+    if _workers_stop_event is not None:
+        _workers_stop_event.set()
+        _sleep_interrupted.set()
+
+    signal.default_int_handler(signum, frame)
+
+
+if threading.current_thread() is threading.main_thread():
+    signal.signal(signal.SIGINT, _handle_sigint)
+
+
+@contextmanager
+def sigint_to_workers(stop_event: threading.Event):
+    global _workers_stop_event
+
+    _workers_stop_event = stop_event
+    try:
+        yield
+    finally:
+        _workers_stop_event = None
+        _sleep_interrupted.clear()
+
+
+def prompt(message: str) -> str:
+    with _prompt_lock:
+        return input(message)
+
+
+def interruptible_sleep(sleep_time: float) -> bool:
+    global _sleeping_threads
+
+    if threading.current_thread() is threading.main_thread():
+        try:
+            time.sleep(sleep_time)
+        except KeyboardInterrupt:
+            return True
+        return False
+
+    with _sleeping_threads_lock:
+        _sleeping_threads += 1
+    try:
+        return _sleep_interrupted.wait(sleep_time)
+    finally:
+        with _sleeping_threads_lock:
+            _sleeping_threads -= 1
+            if not _sleeping_threads:
+                _sleep_interrupted.clear()
+
 
 def sleep(sleep_time: float):
     logger.info(f'[Sleep] Sleeping for {round(sleep_time, 2)} seconds. If you want to skip this, press Ctrl+C')
-    try:
-        time.sleep(sleep_time)
-    except KeyboardInterrupt:
+
+    if interruptible_sleep(sleep_time):
         logger.info('[Sleep] Skipping sleep')
 
 
-def random_sleep():
-    min_sleep_time = getattr(random_sleep, 'min_sleep_time', 1)
-    max_sleep_time = getattr(random_sleep, 'max_sleep_time', 10)
-    sleep_time = round(random.uniform(min_sleep_time, max_sleep_time), 2)
+def random_sleep(
+    min_sleep_time: float = 1,
+    max_sleep_time: float = 10
+):
+    sleep_range = tuple(sorted((min_sleep_time, max_sleep_time)))
+
+    with _sleep_buffer_lock:
+        sleep_buffer = _sleep_buffers.get(sleep_range)
+        if not sleep_buffer:
+            sleep_buffer = _sleep_buffers[sleep_range] = _rng.uniform(*sleep_range, SLEEP_BUFFER_SIZE).round(2).tolist()
+        sleep_time = sleep_buffer.pop()
+
     sleep(sleep_time)
 
 
+def backoff_sleep_time(
+    attempt: int,
+    base_sleep_time: float = 0.5,
+    max_sleep_time: float = 30
+) -> float:
+    return min(max_sleep_time, base_sleep_time * 2 ** min(attempt, 6)) + random.uniform(0, 1)
+
+
+def _probe_geosurf(proxy: dict[str, str]) -> str | bool:
+    response = NO_RETRY_SESSION.get(
+        url='https://geo.geosurf.io/',
+        proxies=proxy,
+        timeout=PROXY_TEST_TIMEOUT
+    )
+    ip_json = orjson.loads(response.content)
+    if 'ip' in ip_json:
+        ip = ip_json['ip']
+        country = ip_json['country']
+        return f'{ip} ({country})'
+    else:
+        return True
+
+
+def _probe_google(proxy: dict[str, str]) -> bool:
+    NO_RETRY_SESSION.head(
+        url='https://google.com',
+        proxies=proxy,
+        timeout=PROXY_TEST_TIMEOUT
+    )
+    return True
+
+
 def test_proxy(proxy: dict[str, str]) -> str | bool:
+    executor = ThreadPoolExecutor(max_workers=2)
+    geosurf_future = executor.submit(_probe_geosurf, proxy)
+    google_future = executor.submit(_probe_google, proxy)
+    deadline = time.monotonic() + PROXY_TEST_TIMEOUT
     try:
-        response = requests.get(
-            url='https://geo.geosurf.io/',
-            proxies=proxy,
-            timeout=5
-        )
-    except KeyboardInterrupt:
-        raise
-    except Exception:
-        try:
-            response = requests.get(
-                url='https://google.com',
-                proxies=proxy,
-                timeout=5
-            )
-        except KeyboardInterrupt:
-            raise
-        except Exception as e:
-            return False
-        else:
-            return True
-    else:
-        ip_json = response.json()
-        if 'ip' in ip_json:
-            ip = ip_json['ip']
-            country = ip_json['country']
-            return f'{ip} ({country})'
-        else:
-            return True
+        wait([geosurf_future], timeout=PROXY_TEST_TIMEOUT)
+        if geosurf_future.done() and geosurf_future.exception() is None:
+            return geosurf_future.result()
+
+        wait([google_future], timeout=max(0, deadline - time.monotonic()))
+        if google_future.done() and google_future.exception() is None:
+            return google_future.result()
+
+        return False
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def test_proxies_bulk(proxies: list[dict[str, str]]) -> list[str | bool]:
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        return list(executor.map(test_proxy, proxies))
 
 
 def wait_for_transaction_receipt(
@@ -70,152 +279,273 @@ def wait_for_transaction_receipt(
     logging_prefix: str = 'Receipt',
     return_on_fail: bool = False
 ) -> TxReceipt:
-    start_time = dt.datetime.now()
-    while True:
+    start_time = time.monotonic()
+    poll_interval = 0.5
+
+    while (elapsed := time.monotonic() - start_time) < timeout:
         try:
-            receipt = web3.wait_for_transaction_receipt(
-                transaction_hash=txn_hash,
-                timeout=timeout - (dt.datetime.now() - start_time).total_seconds()
-            )
+            return web3.get_transaction_receipt(txn_hash)
+        except TransactionNotFound:
+            pass
         except Exception as e:
             logger.warning(f'[{logging_prefix}] Exception occured while waiting for transaction receipt: {e}')
-            if dt.datetime.now() - start_time >= dt.timedelta(seconds=timeout):
-                if return_on_fail:
-                    return None
-                else:
-                    answer = input(f'[{logging_prefix}] Failed to get transaction receipt. Press Enter when transaction will be processed')
-                    try:
-                        receipt = web3.wait_for_transaction_receipt(
-                            transaction_hash=txn_hash,
-                            timeout=5
-                        )
-                    except Exception as e:
-                        logger.error(f'[{logging_prefix}] Failed to get transaction receipt: {e}')
-                        return None
-            time.sleep(min(5, timeout / 10))
-        else:
-            return receipt
 
+        time.sleep(min(poll_interval, timeout - elapsed))
+        poll_interval = min(4, poll_interval * 1.5)
 
-def suggest_gas_fees_metamask(
-    network_name: enums.NetworkNames,
-    proxy: dict[str, str] = None
-):
-    last_update = getattr(suggest_gas_fees_metamask, 'last_update', dt.datetime.fromtimestamp(0))
-    last_network = getattr(suggest_gas_fees_metamask, 'network_name', None)
+    if return_on_fail:
+        return None
 
-    if dt.datetime.now() - last_update > dt.timedelta(seconds=10) or last_network != network_name:
-        gas_price = None
-        network = constants.NETWORKS[network_name]
+    prompt(f'[{logging_prefix}] Failed to get transaction receipt. Press Enter when transaction will be processed')
+    try:
+        return web3.get_transaction_receipt(txn_hash)
+    except Exception as e:
+        logger.error(f'[{logging_prefix}] Failed to get transaction receipt: {e}')
+        return None
 
-        while True:
+
+def wait_for_transaction_receipts_batch(
+    web3: Web3,
+    txn_hashes: list[Hash32 | HexBytes | HexStr],
+    timeout: int = 300,
+    logging_prefix: str = 'Receipt',
+    batch_size: int = 50
+) -> list[TxReceipt | None]:
+    txn_hashes = [HexBytes(txn_hash).hex() for txn_hash in txn_hashes]
+    receipts = {}
+
+    start_time = time.monotonic()
+    poll_interval = 0.5
+
+    while (elapsed := time.monotonic() - start_time) < timeout:
+        pending = [txn_hash for txn_hash in txn_hashes if txn_hash not in receipts]
+        if not pending:
+            break
+
+        for i in range(0, len(pending), batch_size):
+            chunk = pending[i:i + batch_size]
             try:
-                response = requests.get(
-                    url=f'https://gas-api.metaswap.codefi.network/networks/{network_name.value}/suggestedGasFees',
-                    proxies=proxy
+                results = batch_rpc_request(
+                    web3,
+                    [('eth_getTransactionReceipt', [txn_hash]) for txn_hash in chunk]
                 )
-            except Exception:
-                logger.warning(f'[Gas] Failed to get gas price for {network_name}')
-                sleep(10)
+            except Exception as e:
+                logger.warning(f'[{logging_prefix}] Exception occured while waiting for transaction receipts: {e}')
                 continue
-            else:
-                if response.status_code != 200:
-                    logger.warning(f'[Gas] Failed to get gas price for {network_name}')
-                    sleep(10)
-                    continue
-                gas_json = response.json()
-                medium_gas = gas_json['medium']
-                gas_gwei = float(medium_gas['suggestedMaxFeePerGas'])
-                gas_price = {
-                    'maxFeePerGas': Web3.to_wei(gas_gwei, 'gwei'),
-                    'maxPriorityFeePerGas': Web3.to_wei(medium_gas['suggestedMaxPriorityFeePerGas'], 'gwei')
-                }
-
-            if not network.max_gwei or float(gas_gwei) <= network.max_gwei:
-                break
 
-            logger.info(f'[Main] Current gas price {round(gas_gwei, 3)} Gwei is higher than max {network.max_gwei} Gwei in {network_name} network')
+            for txn_hash, result in zip(chunk, results):
+                if result is not None:
+                    receipts[txn_hash] = AttributeDict.recursive(receipt_formatter(result))
 
-            sleep(10)
+        if len(receipts) == len(txn_hashes):
+            break
 
-        suggest_gas_fees_metamask.gas_price = gas_price
-        suggest_gas_fees_metamask.last_update = dt.datetime.now()
-        suggest_gas_fees_metamask.network_name = network_name
+        time.sleep(min(poll_interval, timeout - elapsed))
+        poll_interval = min(4, poll_interval * 1.5)
 
-        return gas_price
+    for txn_hash in txn_hashes:
+        if txn_hash not in receipts:
+            logger.error(f'[{logging_prefix}] Failed to get transaction receipt for {txn_hash}')
+
+    return [receipts.get(txn_hash) for txn_hash in txn_hashes]
+
+
+class _GasApiResponse(NamedTuple):
+    status_code: int
+    headers: Mapping[str, str]
+    content: bytes
+
+
+def _gas_api_get(
+    host: str,
+    path: str,
+    headers: dict[str, str] = None,
+    proxy: dict[str, str] = None
+) -> _GasApiResponse:
+    if proxy:
+        response = SESSION.get(
+            url=f'https://{host}{path}',
+            headers=headers,
+            proxies=proxy,
+            timeout=10
+        )
+        return _GasApiResponse(response.status_code, response.headers, response.content)
+
+    for attempt in range(2):
+        connection = _direct_connections.get(host)
+        if connection is None:
+            connection = _direct_connections[host] = http.client.HTTPSConnection(host, timeout=10)
+
+        try:
+            connection.request('GET', path, headers=headers or {})
+            response = connection.getresponse()
+            return _GasApiResponse(response.status, response.headers, response.read())
+        except (http.client.HTTPException, OSError):
+            connection.close()
+            del _direct_connections[host]
+            if attempt:
+                raise
+
+
+def _metamask_gas(
+    network_name: enums.NetworkNames,
+    proxy: dict[str, str] = None
+) -> tuple[float, dict]:
+    response = _gas_api_get(
+        host=_METAMASK_GAS_HOST,
+        path=f'/networks/{network_name.value}/suggestedGasFees',
+        proxy=proxy
+    )
+    if response.status_code != 200:
+        raise ValueError(f'Unexpected status code {response.status_code}')
+
+    medium_gas = orjson.loads(response.content)['medium']
+    gas_gwei = float(medium_gas['suggestedMaxFeePerGas'])
+    gas_price = {
+        'maxFeePerGas': round(gas_gwei * _GWEI),
+        'maxPriorityFeePerGas': round(float(medium_gas['suggestedMaxPriorityFeePerGas']) * _GWEI)
+    }
+
+    return gas_gwei, gas_price
+
+
+def _rabby_gas(
+    network_name: enums.NetworkNames,
+    proxy: dict[str, str] = None
+) -> tuple[float, dict]:
+    network = constants.NETWORKS[network_name]
+
+    if network.rabby_id is None:
+        return _metamask_gas(network_name, proxy)
+
+    headers = _RABBY_HEADERS
+    last_response = _rabby_last_responses.get(network_name)
+    if last_response:
+        headers = {**_RABBY_HEADERS, 'If-None-Match': last_response[0]}
+
+    try:
+        response = _gas_api_get(
+            host=_RABBY_HOST,
+            path=_RABBY_PATH_TMPL.format(network.rabby_id),
+            headers=headers,
+            proxy=proxy
+        )
+    except Exception:
+        logger.warning(f'[Gas] Failed to get gas price for {network_name} on Rabby')
+        return _metamask_gas(network_name, proxy)
+
+    if response.status_code == 304 and last_response:
+        normal_gas = last_response[1]
+    elif response.status_code != 200:
+        logger.warning(f'[Gas] Failed to get gas price for {network_name} on Rabby')
+        return _metamask_gas(network_name, proxy)
     else:
-        return getattr(suggest_gas_fees_metamask, 'gas_price', None)
+        normal_gas = orjson.loads(response.content)[1]
 
+        etag = response.headers.get('ETag')
+        if etag:
+            _rabby_last_responses[network_name] = (etag, normal_gas)
 
-def suggest_gas_fees(
+    gas_wei = int(normal_gas['price'])
+    priority_gas = normal_gas.get('priority_price', None)
+
+    if priority_gas is not None:
+        gas_price = {
+            'maxFeePerGas': gas_wei,
+            'maxPriorityFeePerGas': int(priority_gas)
+        }
+    else:
+        gas_price = {
+            'gasPrice': gas_wei
+        }
+
+    return gas_wei / _GWEI, gas_price
+
+
+def _fetch_gas(
+    provider_fn: Callable[[enums.NetworkNames, dict[str, str] | None], tuple[float, dict]],
     network_name: enums.NetworkNames,
     proxy: dict[str, str] = None
-):
-    last_update = getattr(suggest_gas_fees, 'last_update', dt.datetime.fromtimestamp(0))
-    last_network = getattr(suggest_gas_fees, 'network_name', None)
+) -> dict:
+    with _gas_fees_lock:
+        cached = _gas_cache.get(network_name)
+        if cached and time.monotonic() < cached[1]:
+            return cached[0]
 
-    if dt.datetime.now() - last_update > dt.timedelta(seconds=10) or last_network != network_name:
         network = constants.NETWORKS[network_name]
 
-        if network.rabby_id is None:
-            return suggest_gas_fees_metamask(network_name, proxy)
+        if network_name == enums.NetworkNames.Scroll:
+            _fetch_gas(provider_fn, enums.NetworkNames.ETH, proxy)
 
         while True:
-            if network_name == enums.NetworkNames.Scroll:
-                suggest_gas_fees(enums.NetworkNames.ETH, proxy)
-
             try:
-                response = requests.get(
-                    url=f'https://api.rabby.io/v1/wallet/gas_market?chain_id={network.rabby_id}',
-                    headers={
-                        'X-Api-Ver': 'v2',
-                        'X-Client': 'Rabby',
-                        'X-Version': '0.92.52',
-                        'X-Api-Nonce': 'n_0LknmB7aJePWhQezXR3SFQeLmf0Q3wDDnSpgDJxS',
-                        'X-Api-Sign': '058c4e73eb35b19a57ffca66643937e447dcacd9a3c653df774fb7c45e328462',
-                        'X-Api-Ts': '1709038705'
-                    },
-                    proxies=proxy
-                )
+                gas_gwei, gas_price = provider_fn(network_name, proxy)
             except Exception:
-                logger.warning(f'[Gas] Failed to get gas price for {network_name} on Rabby')
-                return suggest_gas_fees_metamask(network_name, proxy)
-            else:
-                if response.status_code != 200:
-                    logger.warning(f'[Gas] Failed to get gas price for {network_name} on Rabby')
-                    return suggest_gas_fees_metamask(network_name, proxy)
+                logger.warning(f'[Gas] Failed to get gas price for {network_name}')
+                sleep(10)
+                continue
 
-                gas_json = response.json()
-                normal_gas = gas_json[1]
+            if not network.max_gwei or gas_gwei <= network.max_gwei:
+                break
 
-                gas_wei = int(normal_gas['price'])
-                gas_gwei = Web3.from_wei(gas_wei, 'gwei')
-                priority_gas = normal_gas.get('priority_price', None)
+            logger.info(f'[Main] Current gas price {round(gas_gwei, 3)} Gwei is higher than max {network.max_gwei} Gwei in {network_name} network')
 
-                if not network.max_gwei or float(gas_gwei) <= network.max_gwei:
-                    break
+            sleep(10)
 
-                logger.info(f'[Main] Current gas price {round(gas_gwei, 3)} Gwei is higher than max {network.max_gwei} Gwei in {network_name} network')
+        _gas_cache[network_name] = (gas_price, time.monotonic() + GAS_CACHE_TTL)
 
-                sleep(10)
+        return gas_price
 
-        if priority_gas is not None:
-            gas_price = {
-                'maxFeePerGas': gas_wei,
-                'maxPriorityFeePerGas': int(priority_gas)
-            }
-        else:
-            gas_price = {
-                'gasPrice': gas_wei
-            }
 
-        suggest_gas_fees.gas_price = gas_price
-        suggest_gas_fees.last_update = dt.datetime.now()
-        suggest_gas_fees.network_name = network_name
+def suggest_gas_fees_metamask(
+    network_name: enums.NetworkNames,
+    proxy: dict[str, str] = None
+) -> dict:
+    return _fetch_gas(_metamask_gas, network_name, proxy)
 
-        return gas_price
-    else:
-        return getattr(suggest_gas_fees, 'gas_price', None)
+
+def suggest_gas_fees(
+    network_name: enums.NetworkNames,
+    proxy: dict[str, str] = None
+) -> dict:
+    return _fetch_gas(_rabby_gas, network_name, proxy)
+
+
+def batch_rpc_request(
+    web3: Web3,
+    calls: list[tuple[str, list]]
+) -> list:
+    if not calls:
+        return []
+
+    payload = [
+        {
+            'jsonrpc': '2.0',
+            'id': request_id,
+            'method': method,
+            'params': params
+        }
+        for request_id, (method, params) in enumerate(calls)
+    ]
+
+    response = SESSION.post(
+        web3.provider.endpoint_uri,
+        data=orjson.dumps(payload),
+        **{'timeout': 10, **web3.provider.get_request_kwargs()}
+    )
+    response.raise_for_status()
+
+    response_json = orjson.loads(response.content)
+    if not isinstance(response_json, list):
+        raise ValueError(response_json.get('error', response_json))
+
+    results = [None] * len(calls)
+    for item in response_json:
+        if 'error' in item:
+            raise ValueError(item['error'])
+        results[item['id']] = item['result']
+
+    return results
 
 
 def estimate_gas(
@@ -233,13 +563,14 @@ def estimate_gas(
     return int(web3.eth.estimate_gas(txn_copy) * 1.25)
 
 
+def max_transaction_cost(txn: dict) -> int:
+    fee_per_gas = txn.get('maxFeePerGas', txn.get('gasPrice', 0))
+    return txn.get('value', 0) + txn['gas'] * fee_per_gas
+
+
 def check_username(username: str) -> bool:
-    if re.match(r'^[A-Za-z0-9_]{4,15}$', username):
-        return True
-    return False
+    return _USERNAME_RE.match(username) is not None
 
 
 def check_invite_code(invite_code: str) -> bool:
-    if re.match(r'^[A-Z0-9]{5}$', invite_code):
-        return True
-    return False
+    return len(invite_code) == 5 and _INVITE_CODE_CHARS.issuperset(invite_code)